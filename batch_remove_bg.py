@@ -1,32 +1,164 @@
 import sys
 import os
+import cv2
+import numpy as np
 from rembg import remove
 from PIL import Image
-import pillow_heif  # HEIC support
-from multiprocessing import Pool, cpu_count
+from pillow_heif import register_heif_opener
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 from tqdm import tqdm  # Progress bar goodness
 
+# Let Pillow open .heic directly; decodes straight into Pillow's buffer
+# instead of round-tripping the pixels through a Python bytes object
+register_heif_opener()
+
+# u2net works at 320x320 internally, so feeding it a 24MP photo just
+# marshals pixels into ONNX that get resized away. Above this size we run
+# inference on a bounded copy and upscale only the single-channel mask.
+MAX_INFER_DIM = 2048
+
+# u2net's native input resolution and normalization constants
+_INFER_SIZE = 320
+_NORM_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+_NORM_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# Images per ONNX call in batch mode; amortizes the per-call graph
+# launch overhead across the whole group
+BATCH_SIZE = 16
+
+# One rembg session shared by all worker threads. ONNX Runtime releases the
+# GIL during inference, so threads parallelize fine while the ~170MB model
+# is loaded exactly once, with no fork/spawn re-import cost per worker.
+_SESSION = None
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        from rembg import new_session
+        _SESSION = new_session("u2net")
+    return _SESSION
+
+def _load_rgb(image_path):
+    """Decode an image file to an RGB ndarray, or None if unreadable.
+
+    rembg accepts ndarrays, so skipping the PIL Image wrapper saves one
+    full-image copy per file. HEIC has no cv2 decoder and still comes in
+    through the registered pillow_heif opener.
+    """
+    _, ext = os.path.splitext(image_path)
+    if ext.lower() == ".heic":
+        try:
+            image = Image.open(image_path)
+            # HEIC usually decodes as RGB already; only pay for a convert
+            # (a full-image copy) when it actually isn't
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            return np.asarray(image)
+        except OSError:
+            return None
+    bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if bgr is None:
+        return None
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+def _preprocess(image):
+    """Resize + normalize one RGB image into u2net's (3, 320, 320) input."""
+    small = cv2.resize(image, (_INFER_SIZE, _INFER_SIZE),
+                       interpolation=cv2.INTER_AREA)
+    arr = small.astype(np.float32)
+    arr /= max(arr.max(), 1e-6)
+    arr = (arr - _NORM_MEAN) / _NORM_STD
+    return arr.transpose(2, 0, 1)
+
+def _masks_one_by_one(images):
+    """Per-image fallback: one remove() call per image.
+
+    Returns None in place of a mask for any image whose inference fails,
+    so one bad image can't abort the whole batch.
+    """
+    masks = []
+    for img in images:
+        try:
+            masks.append(remove(img, session=_get_session(), only_mask=True))
+        except Exception:
+            masks.append(None)
+    return masks
+
+def _batched_masks(images):
+    """Run u2net once over a group of images, returning full-size masks.
+
+    Bypasses rembg's one-image-at-a-time remove() and calls the
+    underlying onnxruntime session with an (N, 3, 320, 320) stack, so
+    the per-call graph-launch cost is paid once per batch. The stock
+    u2net.onnx is exported with a static batch dimension of 1 and
+    rejects larger stacks, so batching only happens when the model's
+    batch dim is dynamic; static models (and any inference failure)
+    fall back to per-image remove() calls.
+    """
+    sess = _get_session().inner_session
+    batch_dim = sess.get_inputs()[0].shape[0]
+    if isinstance(batch_dim, int) and batch_dim < len(images):
+        return _masks_one_by_one(images)
+
+    try:
+        inputs = np.stack([_preprocess(img) for img in images])
+        input_name = sess.get_inputs()[0].name
+        preds = sess.run(None, {input_name: inputs})[0][:, 0, :, :]
+    except Exception as e:
+        tqdm.write(f"⚠️ Batched inference failed ({e}); retrying images one by one")
+        return _masks_one_by_one(images)
+
+    masks = []
+    for pred, img in zip(preds, images):
+        # Min-max normalize each mask, as rembg does
+        mi, ma = pred.min(), pred.max()
+        mask = ((pred - mi) / max(ma - mi, 1e-6) * 255).astype(np.uint8)
+        h, w = img.shape[:2]
+        masks.append(cv2.resize(mask, (w, h), interpolation=cv2.INTER_LINEAR))
+    return masks
+
+def _composite_and_save(image_path, image, mask):
+    """Attach a mask as alpha and save the _sticker PNG; returns (ok, msg)."""
+    try:
+        dir_name, file_name = os.path.split(image_path)
+        name, _ = os.path.splitext(file_name)
+        output_path = os.path.join(dir_name, f"{name}_sticker.png")
+        output = np.dstack((image, mask))
+        cv2.imwrite(output_path, cv2.cvtColor(output, cv2.COLOR_RGBA2BGRA))
+        return True, f"✅ Processed: {file_name} → {name}_sticker.png"
+    except Exception as e:
+        return False, f"❌ Error processing {image_path}: {e}"
+
 def remove_bg(image_path):
     """Removes background from a single image and saves it with _sticker suffix."""
     try:
         dir_name, file_name = os.path.split(image_path)
         name, ext = os.path.splitext(file_name)
 
-        # Convert HEIC to PNG if necessary
-        if ext.lower() == ".heic":
-            heif_image = pillow_heif.open_heif(image_path)
-            image = Image.frombytes(heif_image.mode, heif_image.size, heif_image.data)
-        else:
-            image = Image.open(image_path)
+        image = _load_rgb(image_path)
+        if image is None:
+            return f"❌ Error processing {image_path}: could not read image"
 
         # Remove background
-        output = remove(image)
+        h, w = image.shape[:2]
+        if max(h, w) > MAX_INFER_DIM:
+            # Compute the mask on a downscaled copy, then composite it
+            # onto the full-resolution original
+            scale = MAX_INFER_DIM / max(h, w)
+            small = cv2.resize(image, (int(w * scale), int(h * scale)),
+                               interpolation=cv2.INTER_AREA)
+            mask = remove(small, session=_get_session(), only_mask=True)
+            mask = cv2.resize(mask, (w, h), interpolation=cv2.INTER_LINEAR)
+            output = np.dstack((image, mask))
+        else:
+            output = remove(image, session=_get_session())
 
         # Define output filename
         output_path = os.path.join(dir_name, f"{name}_sticker.png")
 
         # Save as transparent PNG
-        output.save(output_path)
+        cv2.imwrite(output_path, cv2.cvtColor(output, cv2.COLOR_RGBA2BGRA))
 
         return f"✅ Processed: {file_name} → {name}_sticker.png"
     
@@ -34,16 +166,52 @@ def remove_bg(image_path):
         return f"❌ Error processing {image_path}: {e}"
 
 def process_images(image_paths):
-    """Handles multiprocessing with a progress bar."""
+    """Handles batched inference with threaded I/O and a progress bar."""
     num_workers = max(1, cpu_count() // 2)  # Use half the CPU cores
-    print(f"⚡ Using {num_workers} parallel workers...")
+    print(f"⚡ Using {num_workers} I/O workers, batch size {BATCH_SIZE}...")
+
+    count_success = 0
+    count_fail = 0
+
+    with ThreadPool(num_workers) as pool:
+        with tqdm(total=len(image_paths), desc="Processing") as progress:
+            for start in range(0, len(image_paths), BATCH_SIZE):
+                batch_paths = image_paths[start:start + BATCH_SIZE]
+
+                # Decode the batch in parallel threads
+                loaded = pool.map(_load_rgb, batch_paths)
+                batch = [(p, img) for p, img in zip(batch_paths, loaded) if img is not None]
+                for p, img in zip(batch_paths, loaded):
+                    if img is None:
+                        # tqdm.write keeps the bar intact; per-image
+                        # success prints would force a redraw each time
+                        tqdm.write(f"❌ Error processing {p}: could not read image")
+                        count_fail += 1
+
+                if batch:
+                    # One ONNX call for the whole group (or per-image
+                    # fallback; see _batched_masks)
+                    masks = _batched_masks([img for _, img in batch])
+
+                    save_jobs = []
+                    for (p, img), m in zip(batch, masks):
+                        if m is None:
+                            count_fail += 1
+                            tqdm.write(f"❌ Error processing {p}: inference failed")
+                        else:
+                            save_jobs.append((p, img, m))
+
+                    # Composite + encode in parallel threads
+                    for ok, msg in pool.starmap(_composite_and_save, save_jobs):
+                        if ok:
+                            count_success += 1
+                        else:
+                            count_fail += 1
+                            tqdm.write(msg)
 
-    with Pool(num_workers) as pool:
-        # Wrap pool.imap with tqdm for progress tracking
-        for result in tqdm(pool.imap(remove_bg, image_paths), total=len(image_paths), desc="Processing"):
-            print(result)  # Print status for each image
+                progress.update(len(batch_paths))
 
-    print("🎉 Batch processing completed!")
+    print(f"🎉 Batch processing completed! {count_success} succeeded, {count_fail} failed.")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -0,0 +1,22 @@
+"""
+Ahead-of-time build for the fused chrominance kernel.
+
+Running `python build_ext.py` compiles _fuse_chroma_impl from
+extract_chrominance.py into a native extension module (chroma_native)
+with numba.pycc, so batch and single-image runs skip the ~1s JIT warmup.
+The extension is optional: extract_chrominance falls back to JIT numba,
+then to plain OpenCV, when it is absent.
+"""
+from numba.pycc import CC
+
+from extract_chrominance import _fuse_chroma_impl
+
+cc = CC('chroma_native')
+cc.verbose = True
+
+# AOT compilation does not support parallel=True, so this exports the
+# serial build of the kernel; prange lowers to a plain range here.
+cc.export('fuse_chroma', 'u1[:,:,:](u1[:,:,:], i8, i8, b1)')(_fuse_chroma_impl)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,8 +1,374 @@
 import cv2
 import os
+import sys
 import argparse
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from multiprocessing import cpu_count, get_context
 from pathlib import Path
+from tqdm import tqdm
+
+# How many files each batch worker reads ahead of the compute stage
+_PREFETCH = 8
+
+# Images at least this big go through the OpenCL T-API (cv2.UMat) in the
+# cv2 fallback path; below it the upload/download overhead isn't worth it
+_OCL_MIN_PIXELS = 1 << 20
+
+try:
+    HAS_OPENCL = cv2.ocl.haveOpenCL()
+except AttributeError:
+    HAS_OPENCL = False
+
+# torch is optional; with a GPU present, the recolor affine maps onto a
+# 1x1 conv2d and images at least this big are worth the device round-trip
+_TORCH_MIN_PIXELS = 4_000_000
+
+try:
+    import torch
+    import torch.nn.functional as F
+except ImportError:
+    torch = None
+
+@lru_cache(maxsize=1)
+def _torch_device():
+    """Return the torch device to offload to, or None to stay on CPU."""
+    if torch is None:
+        return None
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return None
+
+# BT.601 full-range luma weights, in BGR channel order
+_Y_ROW = np.array([[0.114, 0.587, 0.299]], dtype=np.float32)
+
+@lru_cache(maxsize=8)
+def _recolor_matrix(y_value):
+    """
+    Build the 3x4 affine that replaces the whole YCrCb round-trip.
+
+    Converting BGR to YCrCb, overwriting Y with a constant and converting
+    back is a linear map on the pixel followed by a constant offset, so the
+    two cvtColor passes collapse into a single matrix: inv(F) @ diag(0,1,1)
+    @ F applied to BGR, plus y_value times the inverse's Y column (which is
+    all ones). Cached per y_value so batch runs build it once.
+    """
+    fwd = np.vstack([
+        _Y_ROW[0],
+        0.713 * (np.array([0.0, 0.0, 1.0]) - _Y_ROW[0]),   # Cr (minus offset)
+        0.564 * (np.array([1.0, 0.0, 0.0]) - _Y_ROW[0]),   # Cb (minus offset)
+    ])
+    inv = np.linalg.inv(fwd)
+    m = inv @ np.diag([0.0, 1.0, 1.0]) @ fwd
+    bias = y_value * inv[:, 0]
+    return np.hstack([m, bias[:, None]]).astype(np.float32)
+
+# Warm the cache for the default middle-gray case so the dominant path
+# never pays the matrix construction, not even on its first image
+_recolor_matrix(128)
+
+def _fuse_chroma_impl(bgr, y_value, alpha_value, alpha_mode):
+    """
+    Fused BGR -> YCrCb -> set Y -> BGR(A) kernel.
+
+    Reads each BGR pixel once and writes one output pixel, instead of
+    the four full-image passes (two cvtColors, a slice copy and an
+    alpha fill) the cv2 path needs. Uses BT.601 fixed-point (Q14)
+    coefficients so everything stays in integer registers.
+
+    Plain Python here; compiled either ahead of time by build_ext.py or
+    just in time by numba below. Never run uncompiled.
+    """
+    h, w = bgr.shape[0], bgr.shape[1]
+    channels = 4 if alpha_mode else 3
+    out = np.empty((h, w, channels), dtype=np.uint8)
+    for i in numba.prange(h):
+        for j in range(w):
+            b = np.int32(bgr[i, j, 0])
+            g = np.int32(bgr[i, j, 1])
+            r = np.int32(bgr[i, j, 2])
+            # Forward: Y/Cr/Cb from BGR
+            y = (4899 * r + 9617 * g + 1868 * b + 8192) >> 14
+            cr = (((r - y) * 11682 + 8192) >> 14) + 128
+            cb = (((b - y) * 9241 + 8192) >> 14) + 128
+            # Inverse with Y forced to y_value
+            r2 = y_value + (((cr - 128) * 22970 + 8192) >> 14)
+            g2 = y_value - (((cr - 128) * 11700 + (cb - 128) * 5638 + 8192) >> 14)
+            b2 = y_value + (((cb - 128) * 29032 + 8192) >> 14)
+            out[i, j, 0] = min(255, max(0, b2))
+            out[i, j, 1] = min(255, max(0, g2))
+            out[i, j, 2] = min(255, max(0, r2))
+            if alpha_mode:
+                if alpha_value == 255:
+                    out[i, j, 3] = y
+                else:
+                    out[i, j, 3] = (y * alpha_value) >> 8
+    return out
+
+def _make_chroma_kernel(alpha_mode, full_alpha):
+    """
+    JIT-compile a variant of the fused kernel with the mode flags baked in.
+
+    alpha_mode and full_alpha are closure constants, so numba folds the
+    per-pixel mode branches away entirely; the four (alpha on/off x
+    full/scaled alpha) variants are built once and kept in _KERNELS.
+    Same math as _fuse_chroma_impl.
+    """
+    channels = 4 if alpha_mode else 3
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def kernel(bgr, y_value, alpha_value):
+        h, w = bgr.shape[0], bgr.shape[1]
+        out = np.empty((h, w, channels), dtype=np.uint8)
+        for i in numba.prange(h):
+            for j in range(w):
+                b = np.int32(bgr[i, j, 0])
+                g = np.int32(bgr[i, j, 1])
+                r = np.int32(bgr[i, j, 2])
+                y = (4899 * r + 9617 * g + 1868 * b + 8192) >> 14
+                cr = (((r - y) * 11682 + 8192) >> 14) + 128
+                cb = (((b - y) * 9241 + 8192) >> 14) + 128
+                r2 = y_value + (((cr - 128) * 22970 + 8192) >> 14)
+                g2 = y_value - (((cr - 128) * 11700 + (cb - 128) * 5638 + 8192) >> 14)
+                b2 = y_value + (((cb - 128) * 29032 + 8192) >> 14)
+                out[i, j, 0] = min(255, max(0, b2))
+                out[i, j, 1] = min(255, max(0, g2))
+                out[i, j, 2] = min(255, max(0, r2))
+                if alpha_mode:
+                    if full_alpha:
+                        out[i, j, 3] = y
+                    else:
+                        out[i, j, 3] = (y * alpha_value) >> 8
+        return out
+
+    return kernel
+
+# Import numba on its own, not only when the JIT fallback below is
+# needed: build_ext.py re-runs compile _fuse_chroma_impl from this
+# namespace even while chroma_native is importable, and the impl's
+# prange resolves against the numba global.
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Pick the fastest available build of the fused kernel: the AOT-compiled
+# extension from build_ext.py (no JIT warmup on short runs), then the
+# specialized JIT variants, then none at all (the cv2 path in _recolor
+# takes over).
+try:
+    from chroma_native import fuse_chroma as _fuse_chroma
+    HAS_KERNEL = True
+except ImportError:
+    if not HAS_NUMBA:
+        HAS_KERNEL = False
+    else:
+        _KERNELS = {
+            (alpha_mode, full_alpha): _make_chroma_kernel(alpha_mode, full_alpha)
+            for alpha_mode in (False, True)
+            for full_alpha in (False, True)
+        }
+
+        def _fuse_chroma(bgr, y_value, alpha_value, alpha_mode):
+            # Route to the variant with these mode flags baked in
+            return _KERNELS[(alpha_mode, alpha_value == 255)](bgr, y_value, alpha_value)
+
+        HAS_KERNEL = True
+
+def _read_bytes(path):
+    """Read a file into memory, returning None on I/O failure."""
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
+
+def _write_bytes(path, buf):
+    """Write encoded image bytes to disk, returning success."""
+    try:
+        Path(path).write_bytes(buf)
+        return True
+    except OSError:
+        return False
+
+def _decode(buf):
+    """Decode in-memory image bytes to an ndarray (None on failure)."""
+    return cv2.imdecode(np.frombuffer(buf, np.uint8), cv2.IMREAD_UNCHANGED)
+
+def _encode(ext, img):
+    """Encode an image to bytes for the given extension (None on failure)."""
+    ok, buf = cv2.imencode(ext if ext else ".png", img)
+    return buf.tobytes() if ok else None
+
+# Per-process scratch buffers for the cv2 fallback. cv2.transform and
+# cv2.merge allocate a fresh dst on every call; batch runs over
+# same-sized images can reuse one buffer per shape instead. Single slot:
+# the cache holds buffers for one height/width at a time and drops them
+# when a different size arrives, so mixed-size folders don't accumulate
+# a buffer set for every distinct resolution they contain.
+_SCRATCH = {}
+_SCRATCH_HW = None
+
+def _scratch(shape):
+    global _SCRATCH_HW
+    hw = shape[:2]
+    if hw != _SCRATCH_HW:
+        _SCRATCH.clear()
+        _SCRATCH_HW = hw
+    buf = _SCRATCH.get(shape)
+    if buf is None:
+        buf = _SCRATCH[shape] = np.empty(shape, np.uint8)
+    return buf
+
+# The packed BGRA write assumes B lands in the low byte of each word
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+def _pack_bgra(b, g, r, a):
+    """
+    Assemble BGRA by packing each pixel into a single 32-bit word.
+
+    With the contiguous planes cv2.split produces, ORing the shifted
+    channels into uint32 words stores four bytes per pixel at once
+    instead of four strided byte writes. Little-endian only; callers
+    fall back to cv2.merge elsewhere.
+    """
+    words = a.astype(np.uint32)
+    for plane in (r, g, b):
+        words <<= 8
+        words |= plane
+    out = _scratch(b.shape + (4,))
+    out.view(np.uint32).reshape(b.shape)[:] = words
+    return out
+
+def _recolor_torch(bgr, y_value, alpha_mode, alpha_value, device):
+    """
+    Run the recolor affine on a GPU as a 1x1 convolution.
+
+    A 3x3 matrix applied per pixel is exactly a 1x1 conv2d, so this uses
+    the same folded matrix as the cv2 path, with the bias as the conv
+    bias and the luma projection as a second single-row conv for the
+    alpha plane. Pixels cross the PCIe bus once each way.
+    """
+    m = _recolor_matrix(y_value)
+    weight = torch.from_numpy(m[:, :3].copy()).reshape(3, 3, 1, 1).to(device)
+    bias = torch.from_numpy(m[:, 3].copy()).to(device)
+
+    t = torch.from_numpy(np.ascontiguousarray(bgr)).to(device)
+    t = t.permute(2, 0, 1).unsqueeze(0).float()
+    out = F.conv2d(t, weight, bias=bias)
+
+    if alpha_mode:
+        y_weight = torch.from_numpy(_Y_ROW.reshape(1, 3, 1, 1).copy()).to(device)
+        y = F.conv2d(t, y_weight)
+        if alpha_value != 255:
+            # Same y * alpha / 256 scale as the fixed-point paths
+            y = y * (alpha_value / 256.0)
+        out = torch.cat((out, y), dim=1)
+
+    out = out.round().clamp(0, 255).byte()
+    return out.squeeze(0).permute(1, 2, 0).cpu().numpy()
+
+def _recolor(img, y_value, alpha_mode, alpha_value):
+    """
+    Core per-image transform: decoded BGR(A) in, recolored BGR(A) out.
+
+    Dispatches to the fused Numba kernel when available, otherwise to the
+    single-pass cv2.transform fallback.
+    """
+    # Check if the image already has an alpha channel
+    has_alpha = img.shape[2] == 4 if len(img.shape) == 3 else False
+
+    # Drop any existing alpha; the output is rebuilt from the Y channel
+    bgr = img[:, :, :3] if has_alpha else img
+
+    # The fused kernels, the torch path and the uint8 scratch buffers are
+    # all built for 8-bit 3-channel input; IMREAD_UNCHANGED keeps the
+    # source depth, so 16-bit PNG/TIFF must stay on the cv2.transform
+    # path, which saturates correctly at any depth
+    is_u8 = img.ndim == 3 and img.dtype == np.uint8
+
+    # Very large images go to the GPU when torch can see one; the
+    # memory-bound passes run out of device HBM instead of system RAM
+    if is_u8 and bgr.shape[0] * bgr.shape[1] >= _TORCH_MIN_PIXELS:
+        device = _torch_device()
+        if device is not None:
+            return _recolor_torch(bgr, y_value, alpha_mode, alpha_value, device)
+
+    if is_u8 and HAS_KERNEL:
+        # Single fused pass over the image
+        return _fuse_chroma(np.ascontiguousarray(bgr), y_value,
+                            alpha_value, alpha_mode)
+
+    # OpenCV fallback: apply the precomputed affine that folds
+    # BGR -> YCrCb, Y := y_value, YCrCb -> BGR into one pass. Large images
+    # go through the OpenCL T-API via cv2.UMat, staying on the device
+    # across the transforms and downloading the result once.
+    use_ocl = HAS_OPENCL and is_u8 and bgr.shape[0] * bgr.shape[1] >= _OCL_MIN_PIXELS
+    src = cv2.UMat(bgr) if use_ocl else bgr
+
+    if is_u8 and not use_ocl:
+        # Reuse per-process dst buffers so repeated same-sized images in
+        # a batch don't pay a fresh allocation for every transform
+        bgr_result = cv2.transform(src, _recolor_matrix(y_value),
+                                   dst=_scratch(bgr.shape))
+    else:
+        bgr_result = cv2.transform(src, _recolor_matrix(y_value))
+
+    if not alpha_mode:
+        return bgr_result.get() if use_ocl else bgr_result
+
+    # Get original Y channel for the alpha calculation
+    if is_u8 and not use_ocl:
+        y_original = cv2.transform(src, _Y_ROW, dst=_scratch(bgr.shape[:2]))
+    else:
+        y_original = cv2.transform(src, _Y_ROW)
+
+    if alpha_value == 255:
+        # Simple transparency: Y becomes alpha; the merge runs on the
+        # device too when OpenCL is in play
+        b, g, r = cv2.split(bgr_result)
+        if use_ocl:
+            return cv2.merge((b, g, r, y_original)).get()
+        if is_u8 and _LITTLE_ENDIAN:
+            return _pack_bgra(b, g, r, y_original)
+        if is_u8:
+            return cv2.merge((b, g, r, y_original),
+                             dst=_scratch(bgr.shape[:2] + (4,)))
+        return cv2.merge((b, g, r, y_original))
+
+    # Scaled transparency: adjust based on the specified alpha_value
+    # This scales the Y values to maintain their relative relationship
+    # but caps the maximum transparency at alpha_value.
+    # Done as a fixed-point multiply-shift (y * alpha / 256) so the
+    # whole pass stays in uint16 instead of round-tripping through
+    # float64, which would move 8x the bytes for the same result.
+    # The fixed-point math is NumPy-only, so download first if needed.
+    if use_ocl:
+        bgr_result = bgr_result.get()
+        y_original = y_original.get()
+    if is_u8:
+        scaled = y_original.astype(np.uint16)
+        scaled *= np.uint16(alpha_value)
+        np.right_shift(scaled, 8, out=scaled)
+        alpha = scaled.astype(np.uint8)
+    else:
+        # Deeper inputs scale in float at the source depth; the uint16
+        # trick would overflow on 16-bit Y values
+        alpha = (y_original * (alpha_value / 255.0)).astype(bgr.dtype)
+
+    # Interleave BGRA with wide packed stores where the byte order
+    # allows, else a single merge pass
+    b, g, r = cv2.split(bgr_result)
+    if is_u8 and _LITTLE_ENDIAN:
+        return _pack_bgra(b, g, r, alpha)
+    if is_u8:
+        return cv2.merge((b, g, r, alpha), dst=_scratch(bgr.shape[:2] + (4,)))
+    return cv2.merge((b, g, r, alpha))
 
 def extract_chrominance_with_alpha(input_path, output_path=None, y_value=128, alpha_mode=False, alpha_value=255):
     """
@@ -24,53 +390,18 @@ def extract_chrominance_with_alpha(input_path, output_path=None, y_value=128, al
     y_value = max(0, min(255, int(y_value)))
     alpha_value = max(0, min(255, int(alpha_value)))
     
-    # Read the image
-    img = cv2.imread(input_path, cv2.IMREAD_UNCHANGED)
-    
+    # Read and decode the image
+    buf = _read_bytes(input_path)
+    img = _decode(buf) if buf is not None else None
+
     if img is None:
         print(f"Error: Could not read image from {input_path}")
         return False
-    
-    # Check if the image already has an alpha channel
-    has_alpha = img.shape[2] == 4 if len(img.shape) == 3 else False
-    
-    # Convert BGR to YCrCb
-    if has_alpha:
-        # Preserve the alpha channel
-        alpha = img[:, :, 3]
-        bgr = img[:, :, :3]
-        ycrcb = cv2.cvtColor(bgr, cv2.COLOR_BGR2YCrCb)
-    else:
-        ycrcb = cv2.cvtColor(img, cv2.COLOR_BGR2YCrCb)
-    
-    # Get Y channel for potential alpha calculation
-    y_original = ycrcb[:, :, 0].copy() if alpha_mode else None
-    
-    # Set Y channel to the specified value
-    ycrcb[:, :, 0] = y_value
-    
-    # Convert back to BGR
-    bgr_result = cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
-    
-    # Handle alpha channel
+
+    result_img = _recolor(img, y_value, alpha_mode, alpha_value)
+
+    # Handle output path
     if alpha_mode:
-        # Create BGRA image
-        bgra = np.zeros((bgr_result.shape[0], bgr_result.shape[1], 4), dtype=np.uint8)
-        bgra[:, :, :3] = bgr_result
-        
-        # Set alpha based on original Y value
-        if alpha_value == 255:
-            # Simple transparency: Y becomes alpha
-            bgra[:, :, 3] = y_original
-        else:
-            # Scaled transparency: adjust based on the specified alpha_value
-            # This scales the Y values to maintain their relative relationship
-            # but caps the maximum transparency at alpha_value
-            scale_factor = alpha_value / 255.0
-            bgra[:, :, 3] = (y_original * scale_factor).astype(np.uint8)
-        
-        result_img = bgra
-        
         # Make sure output is PNG to preserve transparency
         if output_path is None:
             base, _ = os.path.splitext(input_path)
@@ -82,21 +413,19 @@ def extract_chrominance_with_alpha(input_path, output_path=None, y_value=128, al
                 output_path = f"{base}.png"
                 print(f"Note: Output format changed to PNG to preserve transparency")
     else:
-        # No transparency, use regular BGR output
-        result_img = bgr_result
-        
         # Create default output path if none specified
         if output_path is None:
             base, ext = os.path.splitext(input_path)
             output_path = f"{base}_chroma_y{y_value}{ext}"
     
-    # Ensure the output directory exists
+    # Ensure the output directory exists (exist_ok skips the extra stat)
     output_dir = os.path.dirname(output_path)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     
-    # Save the result
-    success = cv2.imwrite(output_path, result_img)
+    # Encode and save the result
+    encoded = _encode(os.path.splitext(output_path)[1], result_img)
+    success = encoded is not None and _write_bytes(output_path, encoded)
     if success:
         print(f"Processed: {input_path} -> {output_path}")
         if alpha_mode:
@@ -108,6 +437,77 @@ def extract_chrominance_with_alpha(input_path, output_path=None, y_value=128, al
         print(f"Error: Failed to save image to {output_path}")
         return False
 
+def _init_worker():
+    """
+    Pool initializer: pin library thread pools to one thread per worker.
+
+    Each worker already owns a core; without this, OpenCV's internal pool
+    and the parallel=True kernel each spin up cpu_count threads in every
+    worker, oversubscribing the machine N x M and thrashing caches.
+    numba fixes its thread count from the environment at import, so the
+    env var alone is too late -- set_num_threads is the call that
+    actually pins the kernel.
+    """
+    os.environ["OMP_NUM_THREADS"] = "1"
+    cv2.setNumThreads(1)
+    if HAS_NUMBA:
+        numba.set_num_threads(1)
+
+def _process_chunk(jobs):
+    """
+    Pool worker: process a list of job tuples with file I/O overlapped.
+
+    A reader thread prefetches the next few files into memory while the
+    current image is being recolored, and a writer thread handles encode
+    plus write, so disk latency on both sides hides behind the compute.
+
+    Returns:
+        tuple: (count_success, count_fail) for this chunk
+    """
+    count_success = 0
+    count_fail = 0
+    with ThreadPoolExecutor(max_workers=2) as readers, \
+         ThreadPoolExecutor(max_workers=2) as writers:
+        # Prime the read-ahead queue
+        reads = deque(
+            (job, readers.submit(_read_bytes, job[0])) for job in jobs[:_PREFETCH]
+        )
+        next_job = _PREFETCH
+        writes = []
+
+        while reads:
+            job, fut = reads.popleft()
+            # Top up the read-ahead as we consume it
+            if next_job < len(jobs):
+                reads.append((jobs[next_job], readers.submit(_read_bytes, jobs[next_job][0])))
+                next_job += 1
+
+            input_path, output_path, y_value, alpha_mode, alpha_value = job
+            buf = fut.result()
+            img = _decode(buf) if buf is not None else None
+            if img is None:
+                print(f"Error: Could not read image from {input_path}")
+                count_fail += 1
+                continue
+
+            result_img = _recolor(img, y_value, alpha_mode, alpha_value)
+
+            encoded = _encode(os.path.splitext(output_path)[1], result_img)
+            if encoded is None:
+                print(f"Error: Failed to save image to {output_path}")
+                count_fail += 1
+                continue
+            writes.append(writers.submit(_write_bytes, output_path, encoded))
+
+        # Settle the async writes before reporting
+        for w in writes:
+            if w.result():
+                count_success += 1
+            else:
+                count_fail += 1
+
+    return count_success, count_fail
+
 def batch_process_folder(input_folder, output_folder=None, y_value=128, alpha_mode=False, alpha_value=255):
     """
     Process all images in a folder.
@@ -135,11 +535,10 @@ def batch_process_folder(input_folder, output_folder=None, y_value=128, alpha_mo
     else:
         output_folder = Path(output_folder)
     
-    if not output_folder.exists():
-        output_folder.mkdir(parents=True)
-    
+    output_folder.mkdir(parents=True, exist_ok=True)
+
     # Image file extensions to process
-    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff']
+    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff'}
     
     count_success = 0
     count_fail = 0
@@ -149,21 +548,35 @@ def batch_process_folder(input_folder, output_folder=None, y_value=128, alpha_mo
     else:
         print(f"Processing images in {input_folder} with Y={y_value}...")
     
-    # Find all image files in the input folder
+    # Name suffix is loop-invariant, so build it once (alpha mode always
+    # writes PNG to preserve transparency)
+    name_suffix = "_alpha.png" if alpha_mode else f"_y{y_value}"
+
+    # Build the full job list up front; each image is independent
+    jobs = []
     for img_path in input_folder.iterdir():
         if img_path.is_file() and img_path.suffix.lower() in image_extensions:
-            output_filename = f"{img_path.stem}_alpha.png" if alpha_mode else f"{img_path.stem}_y{y_value}{img_path.suffix}"
-            
-            # For alpha mode, always use PNG for output
             if alpha_mode:
-                output_path = output_folder / f"{img_path.stem}_alpha.png"
-            else:
-                output_path = output_folder / output_filename
-            
-            if extract_chrominance_with_alpha(str(img_path), str(output_path), y_value, alpha_mode, alpha_value):
-                count_success += 1
+                output_path = output_folder / (img_path.stem + name_suffix)
             else:
-                count_fail += 1
+                output_path = output_folder / (img_path.stem + name_suffix + img_path.suffix)
+
+            jobs.append((str(img_path), str(output_path), y_value, alpha_mode, alpha_value))
+
+    # Fan the jobs out over a process pool in chunks; each worker overlaps
+    # its own reads and writes with the compute (see _process_chunk).
+    # Spawn rather than fork: forking after the parallel=True kernel has
+    # run in this process hangs at shutdown (numba's OpenMP threading
+    # layer is fork-unsafe), e.g. single image then batch in one session.
+    num_workers = max(1, cpu_count() // 2)
+    chunk_size = max(1, min(32, (len(jobs) + num_workers - 1) // num_workers))
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    with get_context("spawn").Pool(num_workers, initializer=_init_worker) as pool:
+        with tqdm(total=len(jobs), desc="Processing") as progress:
+            for n_ok, n_fail in pool.imap_unordered(_process_chunk, chunks):
+                count_success += n_ok
+                count_fail += n_fail
+                progress.update(n_ok + n_fail)
     
     print(f"\nBatch processing complete.")
     print(f"Successfully processed: {count_success} images")